@@ -12,12 +12,13 @@ Key features:
 - Exports results in both JSON and Markdown formats
 
 Usage:
-    python main.py [--days DAYS] [--results RESULTS] [--model MODEL]
+    python main.py [--days DAYS] [--results RESULTS] [--model MODEL] [--no-cache]
 
 Arguments:
     --days DAYS     Number of days to search (default: 30)
     --results RESULTS   Number of results per query (default: 10)
     --model MODEL   OpenAI model to use (default: "openai/gpt-4o-mini")
+    --no-cache      Re-score every result instead of reusing scores cached in the last week
 
 Environment variables required:
     EXA_API_KEY: API key for Exa
@@ -36,18 +37,28 @@ Version: 1.0
 """
 
 import os
+import re
 import json
+import asyncio
 import logging
 import argparse
 from datetime import datetime, timedelta, UTC
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
-from exa_py.api import Exa
+from itertools import chain
+from operator import itemgetter
+from urllib.parse import urlsplit, urlunsplit
+from typing import List, Dict, Any, Optional, Tuple
+import aiohttp
 from dotenv import load_dotenv
-from openai import OpenAI
-from tenacity import retry, wait_exponential, stop_after_attempt
-from ratelimit import limits, sleep_and_retry
+from openai import AsyncOpenAI, RateLimitError, NOT_GIVEN
+from tenacity import retry, AsyncRetrying, wait_exponential, stop_after_attempt
 import html
+from aisafetyeventsandtraining.rate_limit import RateLimitState, parse_retry_after, wait_retry_after
+from aisafetyeventsandtraining.scorer_cache import ScoreCache, cache_key
+
+try:
+    import orjson
+except ImportError:  # Optional speedup, see the "fast" extra
+    orjson = None
 
 load_dotenv()
 
@@ -63,165 +74,289 @@ OPENAI_MODEL = "openai/gpt-4o-mini"
 MAX_SUMMARY_LENGTH = 500
 RETRY_ATTEMPTS = 5
 RESULTS_FOLDER = "results"
+EXA_SEARCH_URL = "https://api.exa.ai/search"
+EXA_TIMEOUT = 30
+MAX_CONCURRENT_SCORING = 5
+SCORING_BATCH_SIZE = 25  # Items per scoring request; keeps each reply well under the model's output limit
+SCORING_TOKENS_PER_ITEM = 200  # Output budget for one id/score/explanation entry
+SCORING_BASE_TIMEOUT = 30
+SCORING_TIMEOUT_PER_ITEM = 2
+
+SCORE_CACHE_FILE = os.path.join(RESULTS_FOLDER, "score_cache.sqlite3")
+
+SCORING_PROMPT = """You are an AI expert tasked with evaluating potential AI safety events, training opportunities, and open calls. 
+This is for the AI Safety Events and Training newsletter.
+This newsletter ONLY includes upcoming events, training programs, and open calls related to AI safety.
+
+Given the following information about search results, rate each on a scale of 0-10 based on the following STRICT criteria:
+
+Scoring guidelines:
+10: Highly relevant upcoming event, training program, or open call specifically focused on AI safety, with clear future dates and detailed participation information.
+8-9: Relevant upcoming opportunity in AI safety, but may lack some minor details or have a slightly broader focus.
+6-7: Upcoming AI safety related event or opportunity, but missing some important details or not exclusively focused on safety.
+1-5: DO NOT USE THESE SCORES.
+0: Anything that is not a specific upcoming event, training program, or open call related to AI safety. This includes past events, general articles, resources without participation options, or topics not directly tied to AI safety.
+
+Key points:
+- If it's not an upcoming event, training, or open call, it MUST be scored 0.
+- If the date/deadline is in the past or not clearly specified as a future date, it MUST be scored 0.
+- If it lacks a specific date or clear participation information, it should be scored 6 or lower.
+- Only score 8 or above if it's highly relevant to AI safety AND provides clear details for future participation.
+- Pay close attention to avoid duplicate events. If you suspect an event is a duplicate, mention it in the explanation.
+
+The search results are given as a JSON array of objects, each with an "id" and the search "result".
+Respond with a JSON object containing a "scores" array with exactly one entry per search result:
+{"scores": [{"id": [item id], "score": [0, 6, 7, 8, 9, or 10], "explanation": "[2-3 sentence justification, including the specific date of the event/deadline if available. Mention if it appears to be a duplicate.]"}]}
+"""
 
-client = OpenAI(base_url="https://openrouter.ai/api/v1", api_key=os.environ["OPENROUTER_API_KEY"])
+# Legacy plain-text reply layout ("Item N:\nScore: S\nExplanation: ..."), for providers that ignore response_format
+SCORE_RE = re.compile(r"Item\s+(\d+):\s*\n\s*Score:\s*(\d+)\s*\n\s*Explanation:\s*(.+?)(?=\n\s*Item\s+\d+:|\Z)", re.S)
+
+SCORES_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "ai_safety_scores",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "scores": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "integer"},
+                            "score": {"type": "integer", "enum": [0, 6, 7, 8, 9, 10]},
+                            "explanation": {"type": "string"},
+                        },
+                        "required": ["id", "score", "explanation"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["scores"],
+            "additionalProperties": False,
+        },
+    },
+}
+
+# SDK retries are disabled so that 429s reach call_openai_api's Retry-After handling
+client = AsyncOpenAI(base_url="https://openrouter.ai/api/v1", api_key=os.environ["OPENROUTER_API_KEY"], max_retries=0)
+openai_rate_limit = RateLimitState(max_concurrency=MAX_CONCURRENT_SCORING)
+
+# Serialized search results, shared by the score cache keys and the scoring prompts
+_item_json_cache: Dict[Tuple[str, str, str], str] = {}
 
 def get_date_range(days: int) -> tuple[str, str]:
     end_date = datetime.now(UTC)
     start_date = end_date - timedelta(days=days)
     return start_date.isoformat(), end_date.isoformat()
 
-def process_results(results: List[Any], query: str) -> Dict[str, Any]:
+def process_results(results: List[Dict[str, Any]], query: str) -> Dict[str, Any]:
     return {
         "query": query,
         "results": [
             {
-                "title": getattr(item, "title", "No title available"),
-                "url": getattr(item, "url", "No URL available"),
-                "summary": getattr(item, "text", "No summary available")[:MAX_SUMMARY_LENGTH] + "...",
+                "title": item.get("title") or "No title available",
+                "url": item.get("url") or "No URL available",
+                "summary": (item.get("text") or "No summary available")[:MAX_SUMMARY_LENGTH] + "...",
             }
             for item in results
         ]
     }
 
-@retry(wait=wait_exponential(multiplier=1, min=4, max=10), stop=stop_after_attempt(RETRY_ATTEMPTS))
-@sleep_and_retry
-@limits(calls=5, period=60)  # Adjust these values based on API limits
-def call_openai_api(messages: List[Dict[str, str]]) -> str:
+@retry(wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)), stop=stop_after_attempt(RETRY_ATTEMPTS))
+async def call_openai_api(
+    messages: List[Dict[str, Any]], response_format: Any = NOT_GIVEN,
+    max_tokens: Any = NOT_GIVEN, timeout: float = SCORING_BASE_TIMEOUT,
+) -> str:
     try:
-        response = client.chat.completions.create(
-            model=OPENAI_MODEL, 
-            messages=messages,
-            timeout=30  # Add a timeout
-        )
-        return response.choices[0].message.content
+        async with openai_rate_limit:
+            raw_response = await client.chat.completions.with_raw_response.create(
+                model=OPENAI_MODEL, 
+                messages=messages,
+                response_format=response_format,
+                max_tokens=max_tokens,
+                timeout=timeout
+            )
+        openai_rate_limit.update(raw_response.headers)
+        openai_rate_limit.record_success()
+        choice = raw_response.parse().choices[0]
+        if choice.finish_reason == "length":
+            logging.warning("OpenRouter response was cut off at max_tokens")
+        return choice.message.content
+    except RateLimitError as e:
+        openai_rate_limit.update(e.response.headers)
+        openai_rate_limit.record_throttled(parse_retry_after(e.response.headers))
+        logging.warning(f"OpenRouter rate limit hit: {str(e)}")
+        raise
     except Exception as e:
         logging.error(f"OpenRouter API error: {str(e)}")
         raise
 
+def normalize_url(url: str) -> str:
+    # Collapse near-duplicates: tracking params, trailing slashes, host case and fragments
+    parts = urlsplit(url)
+    query = "&".join(param for param in parts.query.split("&") if param and not param.startswith("utm_"))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
 def remove_duplicates(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Returns new query dicts; the input lists are left untouched
     seen = set()
     unique_results = []
     for query_results in data:
-        query_results['results'] = [
-            item for item in query_results['results']
-            if item['url'] not in seen and not seen.add(item['url'])
-        ]
-        unique_results.append(query_results)
+        kept = []
+        for item in query_results['results']:
+            key = normalize_url(item['url'])
+            if key in seen:
+                continue
+            seen.add(key)
+            kept.append(item)
+        unique_results.append({**query_results, 'results': kept})
     return unique_results
 
-def score_results(data: List[Dict[str, Any]], batch_size: int = 10) -> List[Dict[str, Any]]:
-    prompt_template = f"""
-    Today's date: {datetime.now(UTC).date().isoformat()}
-
-    You are an AI expert tasked with evaluating potential AI safety events, training opportunities, and open calls. 
-    This is for the AI Safety Events and Training newsletter.
-    This newsletter ONLY includes upcoming events, training programs, and open calls related to AI safety.
-
-    Given the following information about search results, rate each on a scale of 0-10 based on the following STRICT criteria:
+def item_json(item: Dict[str, Any]) -> str:
+    # Keyed on content rather than URL alone, since results without a URL share a placeholder
+    key = (item['url'], item['title'], item['summary'])
+    serialized = _item_json_cache.get(key)
+    if serialized is None:
+        serialized = _item_json_cache[key] = json.dumps(item, sort_keys=True)
+    return serialized
 
-    Scoring guidelines:
-    10: Highly relevant upcoming event, training program, or open call specifically focused on AI safety, with clear future dates and detailed participation information.
-    8-9: Relevant upcoming opportunity in AI safety, but may lack some minor details or have a slightly broader focus.
-    6-7: Upcoming AI safety related event or opportunity, but missing some important details or not exclusively focused on safety.
-    1-5: DO NOT USE THESE SCORES.
-    0: Anything that is not a specific upcoming event, training program, or open call related to AI safety. This includes past events, general articles, resources without participation options, or topics not directly tied to AI safety.
-
-    Key points:
-    - If it's not an upcoming event, training, or open call, it MUST be scored 0.
-    - If the date/deadline is in the past or not clearly specified as a future date, it MUST be scored 0.
-    - If it lacks a specific date or clear participation information, it should be scored 6 or lower.
-    - Only score 8 or above if it's highly relevant to AI safety AND provides clear details for future participation.
-    - Pay close attention to avoid duplicate events. If you suspect an event is a duplicate, mention it in the explanation.
-
-    Provide your response in the following format for each item:
-    Item [number]:
-    Score: [0, 6, 7, 8, 9, or 10]
-    Explanation: [2-3 sentence justification, including the specific date of the event/deadline if available. Mention if it appears to be a duplicate.]
-
-    Search results:
-    """
+def parse_scores(batch_scores: str) -> Dict[int, Tuple[int, str]]:
+    try:
+        entries = json.loads(batch_scores)["scores"]
+        return {int(entry["id"]): (int(entry["score"]), str(entry["explanation"]).strip()) for entry in entries}
+    except json.JSONDecodeError:
+        scores = {
+            int(m.group(1)): (int(m.group(2)), m.group(3).strip())
+            for m in SCORE_RE.finditer(batch_scores)
+        }
+        if not scores:
+            raise ValueError("Model response is neither JSON nor the plain-text score layout")
+        return scores
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Unexpected scores payload: {str(e)}") from e
+
+async def score_results(
+    data: List[Dict[str, Any]], batch_size: int = SCORING_BATCH_SIZE, cache: Optional[ScoreCache] = None
+) -> List[Dict[str, Any]]:
+    prompt_header = f"Today's date: {datetime.now(UTC).date().isoformat()}\n\nSearch results:\n"
+    # The rubric is identical across requests, so mark it cacheable for providers that support it
+    system_message = {
+        "role": "system",
+        "content": [{"type": "text", "text": SCORING_PROMPT, "cache_control": {"type": "ephemeral"}}],
+    }
 
-    all_items = [item for query_results in data for item in query_results['results']]
+    all_items = list(chain.from_iterable(query_results['results'] for query_results in data))
+    sizes = [len(query_results['results']) for query_results in data]
+
+    # Serve previously scored items from the cache and only send the misses to OpenRouter
+    misses: List[Dict[str, Any]] = []
+    miss_keys: List[str] = []
+    for item in all_items:
+        key = cache_key(OPENAI_MODEL, SCORING_PROMPT, item_json(item))
+        cached = cache.get(key) if cache is not None else None
+        if cached is not None:
+            item['ai_safety_score'], item['score_explanation'] = cached
+        else:
+            misses.append(item)
+            miss_keys.append(key)
+    logging.info(f"{len(all_items) - len(misses)} scores served from cache, {len(misses)} items to score")
+
+    async def score_batch(i: int, batch: List[Dict[str, Any]]) -> None:
+        full_prompt = "".join([
+            prompt_header,
+            "[",
+            ",".join(f'{{"id": {j + 1}, "result": {item_json(item)}}}' for j, item in enumerate(batch)),
+            "]",
+        ])
 
-    for i in range(0, len(all_items), batch_size):
-        batch = all_items[i:i+batch_size]
-        full_prompt = prompt_template + "\n".join([f"Item {j+1}:\n" + json.dumps(item) for j, item in enumerate(batch)])
-        
         try:
-            batch_scores = call_openai_api([
-                {"role": "system", "content": "You are an AI safety expert."},
-                {"role": "user", "content": full_prompt}
-            ])
+            batch_scores = await call_openai_api(
+                [system_message, {"role": "user", "content": full_prompt}],
+                response_format=SCORES_RESPONSE_FORMAT,
+                max_tokens=SCORING_TOKENS_PER_ITEM * len(batch),
+                timeout=SCORING_BASE_TIMEOUT + SCORING_TIMEOUT_PER_ITEM * len(batch),
+            )
             
             if batch_scores:
-                item_scores = batch_scores.split("\n\n")
-                for j, item_score in enumerate(item_scores):
-                    if i + j < len(all_items):
-                        lines = item_score.split("\n")
-                        score = 0
-                        explanation = "Failed to parse score and explanation."
-                        
-                        try:
-                            for line in lines:
-                                if line.startswith("Score:"):
-                                    score = int(line.split(":")[1].strip())
-                                elif line.startswith("Explanation:"):
-                                    explanation = line.replace("Explanation:", "").strip()
-                                    explanation += " ".join(lines[lines.index(line)+1:])
-                                    break
-                        except (IndexError, ValueError) as e:
-                            logging.warning(f"Failed to parse score for item: {batch[j].get('title', 'Unknown')}. Error: {str(e)}")
-                        
-                        all_items[i + j]['ai_safety_score'] = score
-                        all_items[i + j]['score_explanation'] = explanation
+                scores = parse_scores(batch_scores)
+                for j, item in enumerate(batch):
+                    if j + 1 in scores:
+                        score, explanation = scores[j + 1]
+                        if cache is not None:
+                            cache.set(miss_keys[i + j], (score, explanation))
+                    else:
+                        logging.warning(f"No score returned for item: {item.get('title', 'Unknown')}")
+                        score, explanation = 0, "Failed to parse score and explanation."
+                    item['ai_safety_score'] = score
+                    item['score_explanation'] = explanation
             else:
                 logging.warning("Empty batch_scores from OpenAI")
-                for j in range(batch_size):
-                    if i + j < len(all_items):
-                        all_items[i + j]['ai_safety_score'] = 0
-                        all_items[i + j]['score_explanation'] = "Empty batch_scores from OpenAI"
+                for item in batch:
+                    item['ai_safety_score'] = 0
+                    item['score_explanation'] = "Empty batch_scores from OpenAI"
         except Exception as e:
             logging.error(f"Error scoring batch: {str(e)}")
-            for j in range(batch_size):
-                if i + j < len(all_items):
-                    all_items[i + j]['ai_safety_score'] = 0
-                    all_items[i + j]['score_explanation'] = "Error occurred during batch scoring."
-
-    item_index = 0
-    for query_results in data:
+            for item in batch:
+                item['ai_safety_score'] = 0
+                item['score_explanation'] = "Error occurred during batch scoring."
+
+    # Large batches send the rubric only a few times; the cap bounds each reply's size and latency
+    await asyncio.gather(*[
+        score_batch(i, misses[i:i+batch_size]) for i in range(0, len(misses), batch_size)
+    ])
+
+    # Offsets come from the pre-filter sizes; the filtered lists are shorter
+    offset = 0
+    for query_results, count in zip(data, sizes):
         query_results['results'] = [
-            item for item in all_items[item_index:item_index+len(query_results['results'])]
+            item for item in all_items[offset:offset+count]
             if item['ai_safety_score'] >= 6  # Only keep items with score 6 or higher
         ]
-        item_index += len(query_results['results'])
+        offset += count
 
-    data = remove_duplicates(data)
     return data
 
 def export_to_json(data: List[Dict[str, Any]], filename: str) -> None:
     try:
-        with open(filename, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        if orjson is not None:
+            with open(filename, "wb") as f:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
     except IOError as e:
         logging.error(f"Error writing JSON file: {str(e)}")
 
 def export_to_markdown(data: List[Dict[str, Any]], filename: str) -> None:
+    # sorted() is stable under reverse=True, so equal scores keep their query order
+    sorted_items = sorted(
+        chain.from_iterable(query_results["results"] for query_results in data),
+        key=itemgetter('ai_safety_score'),
+        reverse=True,
+    )
+
+    # Build the whole document in memory and write it out in one call
+    parts = ["# AI Safety Event Search Results\n\n"]
+    if not sorted_items:
+        parts.append("No relevant AI safety events found.\n")
+    for item in sorted_items:
+        title = html.escape(item['title'])
+        url = html.escape(item['url'])
+        summary = html.escape(item['summary'])
+        explanation = html.escape(item['score_explanation'])
+        parts.append(
+            f"## {title} (Score: {item['ai_safety_score']})\n"
+            f"- URL: {url}\n"
+            f"- Summary: {summary}\n"
+            f"- Explanation: {explanation}\n\n"
+        )
+
     try:
         with open(filename, "w", encoding="utf-8") as f:
-            f.write("# AI Safety Event Search Results\n\n")
-            
-            all_items = [item for query_results in data for item in query_results["results"]]
-            sorted_items = sorted(all_items, key=lambda x: x['ai_safety_score'], reverse=True)
-            
-            if not sorted_items:
-                f.write("No relevant AI safety events found.\n")
-            else:
-                for item in sorted_items:
-                    f.write(f"## {html.escape(item['title'])} (Score: {item['ai_safety_score']})\n")
-                    f.write(f"- URL: {html.escape(item['url'])}\n")
-                    f.write(f"- Summary: {html.escape(item['summary'])}\n")
-                    f.write(f"- Explanation: {html.escape(item['score_explanation'])}\n\n")
+            f.write("".join(parts))
     except IOError as e:
         logging.error(f"Error writing Markdown file: {str(e)}")
 
@@ -233,23 +368,75 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument("--days", type=int, default=DAYS, help="Number of days to search")
     parser.add_argument("--results", type=int, default=NUM_RESULTS, help="Number of results per query")
     parser.add_argument("--model", type=str, default=OPENAI_MODEL, help="OpenAI model to use")
+    parser.add_argument("--no-cache", action="store_true", help="Re-score every result instead of reusing cached scores")
     return parser.parse_args()
 
-@retry(wait=wait_exponential(multiplier=1, min=4, max=10), stop=stop_after_attempt(RETRY_ATTEMPTS))
-def search_and_process(exa: Exa, query: str, start_date: str, end_date: str, num_results: int) -> Dict[str, Any]:
+async def search_and_process(
+    session: aiohttp.ClientSession, rate_limit: RateLimitState,
+    query: str, start_date: str, end_date: str, num_results: int,
+) -> Dict[str, Any]:
+    payload = {
+        "query": query,
+        "type": "neural",
+        "useAutoprompt": False,
+        "numResults": num_results,
+        "contents": {"text": True},
+        "startPublishedDate": start_date,
+        "endPublishedDate": end_date,
+    }
     try:
-        search_response = exa.search_and_contents(
-            query, type="neural", use_autoprompt=False, num_results=num_results,
-            text=True, start_published_date=start_date, end_published_date=end_date,
-        )
-        processed_results = process_results(search_response.results, query)
+        async for attempt in AsyncRetrying(
+            wait=wait_retry_after(wait_exponential(multiplier=1, min=4, max=10)),
+            stop=stop_after_attempt(RETRY_ATTEMPTS),
+            reraise=True,
+        ):
+            with attempt:
+                async with rate_limit, session.post(
+                    EXA_SEARCH_URL, json=payload, headers={"x-api-key": os.environ["EXA_API_KEY"]}
+                ) as response:
+                    rate_limit.update(response.headers)
+                    if response.status == 429:
+                        rate_limit.record_throttled(parse_retry_after(response.headers))
+                    response.raise_for_status()
+                    search_response = await response.json()
+                rate_limit.record_success()
+        processed_results = process_results(search_response.get("results", []), query)
         logging.info(f"Processed query: {query}")
         return processed_results
     except Exception as e:
         logging.error(f"Error querying for '{query}': {str(e)}")
         return {"query": query, "results": []}
 
-def main() -> None:
+class ExaBatch:
+    """Queues Exa searches and runs them as one batch over a shared session"""
+
+    def __init__(self) -> None:
+        self._requests: List[tuple[str, str, str, int]] = []
+
+    def add(self, query: str, start_date: str, end_date: str, num_results: int) -> None:
+        self._requests.append((query, start_date, end_date, num_results))
+
+    async def execute(self, max_workers: int = 10) -> List[Dict[str, Any]]:
+        """Run all queued searches, returning results in insertion order"""
+        rate_limit = RateLimitState(max_concurrency=max_workers)
+        connector = aiohttp.TCPConnector(limit=max_workers)
+        timeout = aiohttp.ClientTimeout(total=EXA_TIMEOUT)
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as session:
+            responses = await asyncio.gather(
+                *[search_and_process(session, rate_limit, *request) for request in self._requests],
+                return_exceptions=True,
+            )
+
+        results = []
+        for (query, *_), response in zip(self._requests, responses):
+            if isinstance(response, BaseException):
+                logging.error(f"Unexpected error in search task for '{query}': {str(response)}")
+                results.append({"query": query, "results": []})
+            else:
+                results.append(response)
+        return results
+
+async def main() -> None:
     setup_logging()
     args = parse_arguments()
     
@@ -257,19 +444,6 @@ def main() -> None:
     OPENAI_MODEL = args.model  # Use the model specified in arguments
 
     try:
-        exa = Exa(api_key=os.environ["EXA_API_KEY"])
-
-        # Test API connections
-        exa.search("test", num_results=1)
-        logging.info("Exa API connection successful")
-
-        client.chat.completions.create(
-            model=args.model,
-            messages=[{"role": "user", "content": "Hello, this is a test."}],
-            max_tokens=5
-        )
-        logging.info("OpenRouter API connection successful")
-
         start_date_str, end_date_str = get_date_range(days=args.days)
 
         queries = [
@@ -295,14 +469,10 @@ def main() -> None:
         else:
             logging.info(f"Results folder '{RESULTS_FOLDER}' already exists.")
 
-        with ThreadPoolExecutor(max_workers=5) as executor:
-            futures = [executor.submit(search_and_process, exa, query, start_date_str, end_date_str, args.results) for query in queries]
-            
-            all_results = []
-            for future in as_completed(futures):
-                result = future.result()
-                if result["results"]:
-                    all_results.append(result)
+        batch = ExaBatch()
+        for query in queries:
+            batch.add(query, start_date_str, end_date_str, args.results)
+        all_results = [result for result in await batch.execute(max_workers=10) if result["results"]]
 
         successful_queries = sum(1 for result in all_results if result["results"])
         failed_queries = len(queries) - successful_queries
@@ -312,8 +482,15 @@ def main() -> None:
             logging.warning("No results found for any query. Exiting.")
             return
 
-        scored_results = score_results(all_results, batch_size=10)
-        unique_results = remove_duplicates(scored_results)
+        # Drop repeated URLs across queries so each result is only scored once
+        all_results = remove_duplicates(all_results)
+
+        cache = None if args.no_cache else ScoreCache(SCORE_CACHE_FILE)
+        try:
+            unique_results = await score_results(all_results, cache=cache)
+        finally:
+            if cache is not None:
+                cache.close()
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         json_filename = os.path.join(RESULTS_FOLDER, f"ai_safety_events_{timestamp}.json")
@@ -329,4 +506,4 @@ def main() -> None:
         raise
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    asyncio.run(main())
\ No newline at end of file
@@ -1,9 +1,11 @@
 import os
 import logging
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
 from typing import Dict, List, Tuple
 from anthropic import Anthropic
 from pyairtable import Api
+from pyairtable.formulas import AND, EQUAL, FIELD, LESS_EQUAL
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -24,6 +26,7 @@ class Config:
     CLAUDE_MODEL: str = "claude-3-5-sonnet-20241022"
     CLAUDE_MAX_TOKENS: int = 2000
     DAYS_LOOKBACK: int = 7
+    AIRTABLE_PAGE_SIZE: int = 100
 
     # Airtable Configuration
     TABLE_NAME: str = "Calendar"
@@ -39,17 +42,23 @@ class Config:
         "url": "URL",
     }
 
+    # Per-event text sent to the LLM
+    EVENT_TEMPLATE: str = (
+        'Name: "{name}"\n'
+        'Dates: "{start_date}" to "{end_date}"\n'
+        'Location: "{location}"\n'
+        'Description: "{description}"\n'
+        'Type: "{type}"\n'
+        'URL: "{url}"'
+    )
+
     # Add output directory configuration
     OUTPUT_DIR: str = "output"
 
-    # Output Files
+    # Output file name templates, filled with the ISO week string
     OUTPUT_FILES = {
-        "newsletter": lambda: os.path.join(
-            Config.OUTPUT_DIR, f"newsletter_{Config.get_iso_week_str()}.md"
-        ),
-        "social": lambda: os.path.join(
-            Config.OUTPUT_DIR, f"social_{Config.get_iso_week_str()}.md"
-        ),
+        "newsletter": "newsletter_{week}.md",
+        "social": "social_{week}.md",
     }
 
     # LLM Prompts
@@ -115,10 +124,15 @@ class Config:
     """
 
     @staticmethod
-    def get_iso_week_str() -> str:
-        """Get current ISO week string in format YYYYWWW (e.g., 2024W46)"""
+    def get_iso_week() -> Tuple[int, int]:
+        """Get current year and ISO week number from a single clock reading"""
         current_date = datetime.now()
-        return f"{current_date.year}W{current_date.isocalendar()[1]:02d}"
+        return current_date.year, current_date.isocalendar()[1]
+
+    @staticmethod
+    def get_iso_week_str(year: int, week: int) -> str:
+        """Format year and week as YYYYWWW (e.g., 2024W46)"""
+        return f"{year}W{week:02d}"
 
 
 class AirtableClient:
@@ -130,27 +144,27 @@ class AirtableClient:
 
     def get_recent_unpublished_events(self) -> List[Dict]:
         """Get events added in the last 7 days that aren't published"""
-        cutoff_date = (datetime.now() - timedelta(days=Config.DAYS_LOOKBACK)).strftime(
-            "%Y-%m-%d"
+        field_names = Config.FIELD_NAMES
+        created_key, pub_key, start_key = (
+            field_names["created_date"],
+            field_names["publish"],
+            field_names["start_date"],
         )
 
         try:
             logger.info(
                 f"Fetching records from base: {Config.AIRTABLE_BASE_ID}, table: {Config.TABLE_NAME}"
             )
-            records = self.table.all()
-            filtered_records = [
-                record
-                for record in records
-                if (
-                    record["fields"].get(Config.FIELD_NAMES["created_date"], "")
-                    >= cutoff_date
-                    and record["fields"].get(Config.FIELD_NAMES["publish"], False)
-                )
-            ]
-            return sorted(
-                filtered_records,
-                key=lambda x: x["fields"].get(Config.FIELD_NAMES["start_date"], ""),
+            # Filter and sort server-side so only recent, publishable rows are transferred
+            formula = AND(
+                LESS_EQUAL(
+                    f"DATETIME_DIFF(TODAY(), {FIELD(created_key)}, 'days')",
+                    Config.DAYS_LOOKBACK,
+                ),
+                EQUAL(FIELD(pub_key), 1),
+            )
+            return self.table.all(
+                page_size=Config.AIRTABLE_PAGE_SIZE, formula=formula, sort=[start_key]
             )
         except Exception as e:
             logger.error(f"Error fetching Airtable records: {e}")
@@ -165,65 +179,92 @@ class ContentGenerator:
 
     def prepare_events_data(self, events: List[Dict]) -> str:
         """Convert events to simple text format for LLM"""
+        field_names = Config.FIELD_NAMES
+        name_key, start_key, end_key = (
+            field_names["name"],
+            field_names["start_date"],
+            field_names["end_date"],
+        )
+        loc_key, desc_key, type_key, url_key = (
+            field_names["location"],
+            field_names["description"],
+            field_names["type"],
+            field_names["url"],
+        )
+        template = Config.EVENT_TEMPLATE
+
         formatted_events = []
         for event in events:
             fields = event["fields"]
-            event_str = (
-                f'Name: "{fields.get(Config.FIELD_NAMES["name"], "")}"'
-                f'\nDates: "{fields.get(Config.FIELD_NAMES["start_date"], "")}" to "{fields.get(Config.FIELD_NAMES["end_date"], "")}"'
-                f'\nLocation: "{fields.get(Config.FIELD_NAMES["location"], "")}"'
-                f'\nDescription: "{fields.get(Config.FIELD_NAMES["description"], "")}"'
-                f'\nType: "{fields.get(Config.FIELD_NAMES["type"], ["Event"])}"'
-                f'\nURL: "{fields.get(Config.FIELD_NAMES["url"], "")}"'
+            formatted_events.append(
+                template.format(
+                    name=fields.get(name_key, ""),
+                    start_date=fields.get(start_key, ""),
+                    end_date=fields.get(end_key, ""),
+                    location=fields.get(loc_key, ""),
+                    description=fields.get(desc_key, ""),
+                    type=fields.get(type_key, ["Event"]),
+                    url=fields.get(url_key, ""),
+                )
             )
-            formatted_events.append(event_str)
         return "\n\n".join(formatted_events)
 
-    def generate_content(self, events: List[Dict]) -> Tuple[str, str]:
+    def _generate(self, prompt: str, events_data: str) -> str:
+        """Run a single Claude completion for the given format prompt"""
+        return (
+            self.client.messages.create(
+                model=Config.CLAUDE_MODEL,
+                max_tokens=Config.CLAUDE_MAX_TOKENS,
+                # System prompt and events come first and are marked cacheable so
+                # that only the format instructions differ between requests
+                system=[
+                    {
+                        "type": "text",
+                        "text": Config.SYSTEM_PROMPT,
+                        "cache_control": {"type": "ephemeral"},
+                    }
+                ],
+                messages=[
+                    {
+                        "role": "user",
+                        "content": [
+                            {
+                                "type": "text",
+                                "text": f"Events:\n{events_data}",
+                                "cache_control": {"type": "ephemeral"},
+                            },
+                            {"type": "text", "text": prompt},
+                        ],
+                    }
+                ],
+            )
+            .content[0]
+            .text
+        )
+
+    def generate_content(
+        self, events: List[Dict], year: int, week: int
+    ) -> Tuple[str, str]:
         """Generate both newsletter and social posts"""
         if not events:
             return "No events to display", "No events to display"
 
         events_data = self.prepare_events_data(events)
-        current_week = datetime.now().isocalendar()[1]
-        current_year = datetime.now().year
 
         try:
-            # Generate newsletter with year and week
-            newsletter = (
-                self.client.messages.create(
-                    model=Config.CLAUDE_MODEL,
-                    max_tokens=Config.CLAUDE_MAX_TOKENS,
-                    system=Config.SYSTEM_PROMPT,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": f"{Config.NEWSLETTER_PROMPT.format(YEAR=current_year, WEEK=current_week)}\n\nEvents:\n{events_data}",
-                        }
-                    ],
+            # The two posts are independent, so request them concurrently
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                newsletter_future = executor.submit(
+                    self._generate,
+                    Config.NEWSLETTER_PROMPT.format(YEAR=year, WEEK=week),
+                    events_data,
                 )
-                .content[0]
-                .text
-            )
-
-            # Generate social post with year and week
-            social = (
-                self.client.messages.create(
-                    model=Config.CLAUDE_MODEL,
-                    max_tokens=Config.CLAUDE_MAX_TOKENS,
-                    system=Config.SYSTEM_PROMPT,
-                    messages=[
-                        {
-                            "role": "user",
-                            "content": f"{Config.SOCIAL_PROMPT.format(YEAR=current_year, WEEK=current_week)}\n\nEvents:\n{events_data}",
-                        }
-                    ],
+                social_future = executor.submit(
+                    self._generate,
+                    Config.SOCIAL_PROMPT.format(YEAR=year, WEEK=week),
+                    events_data,
                 )
-                .content[0]
-                .text
-            )
-
-            return newsletter, social
+                return newsletter_future.result(), social_future.result()
         except Exception as e:
             logger.error(f"Error generating content: {e}")
             return "Error generating content", "Error generating content"
@@ -242,15 +283,27 @@ def main():
         logger.info("No new unpublished events found")
         return
 
-    newsletter_content, social_content = content_generator.generate_content(events)
+    # Compute the week once so the post text and both file names always agree
+    year, week = Config.get_iso_week()
+    newsletter_content, social_content = content_generator.generate_content(
+        events, year, week
+    )
 
     try:
         # Create output directory if it doesn't exist
         os.makedirs(Config.OUTPUT_DIR, exist_ok=True)
 
-        with open(Config.OUTPUT_FILES["newsletter"](), "w") as f:
+        week_str = Config.get_iso_week_str(year, week)
+        newsletter_path = os.path.join(
+            Config.OUTPUT_DIR, Config.OUTPUT_FILES["newsletter"].format(week=week_str)
+        )
+        social_path = os.path.join(
+            Config.OUTPUT_DIR, Config.OUTPUT_FILES["social"].format(week=week_str)
+        )
+
+        with open(newsletter_path, "w") as f:
             f.write(newsletter_content)
-        with open(Config.OUTPUT_FILES["social"](), "w") as f:
+        with open(social_path, "w") as f:
             f.write(social_content)
         logger.info("Successfully wrote content to files")
     except Exception as e:
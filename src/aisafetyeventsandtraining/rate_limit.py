@@ -0,0 +1,144 @@
+"""Header-driven rate limiting for outbound API calls."""
+
+import re
+import time
+import asyncio
+import logging
+from datetime import datetime, UTC
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Mapping, Optional
+from tenacity import RetryCallState
+from tenacity.wait import wait_base
+
+REMAINING_HEADERS = ("x-ratelimit-remaining-requests", "x-ratelimit-remaining")
+RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset")
+DURATION_PART_RE = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+DURATION_UNITS = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+
+
+def _first_header(headers: Mapping[str, str], names: tuple[str, ...]) -> Optional[str]:
+    for name in names:
+        value = headers.get(name)
+        if value is not None:
+            return value
+    return None
+
+
+def parse_retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    """Seconds to wait according to a Retry-After header (delta-seconds or HTTP date)"""
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(UTC)).total_seconds())
+
+
+def parse_reset(value: str) -> Optional[float]:
+    """Seconds until a rate limit window resets.
+
+    Accepts OpenAI-style durations ("1s", "6m0s", "20ms") and OpenRouter-style
+    epoch timestamps in milliseconds.
+    """
+    parts = DURATION_PART_RE.findall(value)
+    if parts:
+        return sum(float(amount) * DURATION_UNITS[unit] for amount, unit in parts)
+    try:
+        number = float(value)
+    except ValueError:
+        return None
+    if number > 1e12:  # epoch milliseconds
+        return max(0.0, number / 1000 - time.time())
+    if number > 1e9:  # epoch seconds
+        return max(0.0, number - time.time())
+    return number
+
+
+def retry_after_from_exception(exc: BaseException) -> Optional[float]:
+    """Retry-After of a throttled HTTP error from either the OpenAI SDK or aiohttp"""
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) or getattr(exc, "status", None)
+    headers = getattr(response, "headers", None) or getattr(exc, "headers", None)
+    if status != 429 or headers is None:
+        return None
+    return parse_retry_after(headers)
+
+
+class wait_retry_after(wait_base):
+    """Tenacity wait that honors the server's Retry-After on 429s and otherwise defers to `fallback`"""
+
+    def __init__(self, fallback: Callable[[RetryCallState], float]) -> None:
+        self.fallback = fallback
+
+    def __call__(self, retry_state: RetryCallState) -> float:
+        exc = retry_state.outcome.exception() if retry_state.outcome else None
+        retry_after = retry_after_from_exception(exc) if exc is not None else None
+        return retry_after if retry_after is not None else self.fallback(retry_state)
+
+
+class RateLimitState:
+    """Shared view of a provider's rate limit, fed by its response headers.
+
+    Hold a request slot with `async with state:`. Entering pauses while the
+    provider reports `min_remaining` or fewer requests left in the window, and
+    the number of slots follows AIMD: halved on a 429, grown by half a slot
+    after each successful response.
+    """
+
+    def __init__(self, max_concurrency: int, min_remaining: int = 2) -> None:
+        self.max_concurrency = max_concurrency
+        self.concurrency = float(max_concurrency)
+        self.min_remaining = min_remaining
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def wait_if_throttled(self) -> None:
+        while self.remaining is not None and self.remaining <= self.min_remaining:
+            delay = self.reset_at - time.monotonic()
+            if delay <= 0:
+                self.remaining = None
+                break
+            logging.info(f"Rate limit nearly exhausted, pausing {delay:.1f}s until the window resets")
+            await asyncio.sleep(delay)
+
+    async def __aenter__(self) -> "RateLimitState":
+        await self.wait_if_throttled()
+        async with self._condition:
+            await self._condition.wait_for(lambda: self._in_flight < max(1, int(self.concurrency)))
+            self._in_flight += 1
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        async with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Record the remaining quota and reset time advertised in response headers"""
+        remaining = _first_header(headers, REMAINING_HEADERS)
+        reset = _first_header(headers, RESET_HEADERS)
+        try:
+            if remaining is not None:
+                self.remaining = int(float(remaining))
+        except ValueError:
+            pass
+        reset_in = parse_reset(reset) if reset is not None else None
+        if reset_in is not None:
+            self.reset_at = time.monotonic() + reset_in
+
+    def record_success(self) -> None:
+        self.concurrency = min(float(self.max_concurrency), self.concurrency + 0.5)
+
+    def record_throttled(self, retry_after: Optional[float]) -> None:
+        self.concurrency = max(1.0, self.concurrency / 2)
+        if retry_after is not None:
+            self.remaining = 0
+            self.reset_at = time.monotonic() + retry_after
@@ -0,0 +1,54 @@
+"""SQLite-backed cache of OpenRouter scores, keyed by item content."""
+
+import os
+import time
+import hashlib
+import sqlite3
+from datetime import timedelta
+from typing import Optional, Tuple
+
+DEFAULT_MAX_AGE = timedelta(weeks=1)
+
+
+def cache_key(model: str, system_prompt: str, item_json: str) -> str:
+    """Content hash of a scoring request; item_json must be serialized with sort_keys=True"""
+    payload = model + system_prompt + item_json
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ScoreCache:
+    """Persists parsed (score, explanation) pairs between runs"""
+
+    def __init__(self, path: str, max_age: timedelta = DEFAULT_MAX_AGE) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.max_age = max_age
+        self._conn = sqlite3.connect(path, isolation_level=None)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS scores ("
+            "key TEXT PRIMARY KEY, score INTEGER NOT NULL, explanation TEXT NOT NULL, created_at REAL NOT NULL)"
+        )
+
+    def get(self, key: str) -> Optional[Tuple[int, str]]:
+        """Return the cached (score, explanation), or None if missing or expired"""
+        row = self._conn.execute(
+            "SELECT score, explanation, created_at FROM scores WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or time.time() - row[2] > self.max_age.total_seconds():
+            return None
+        return row[0], row[1]
+
+    def set(self, key: str, value: Tuple[int, str]) -> None:
+        score, explanation = value
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO scores (key, score, explanation, created_at) VALUES (?, ?, ?, ?)",
+                (key, score, explanation, time.time()),
+            )
+        except sqlite3.Error:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def close(self) -> None:
+        self._conn.close()